@@ -0,0 +1,65 @@
+import os
+from typing import Dict, List, Optional
+from cachetools import TTLCache
+
+# Cache configuration
+PROMPT_CACHE_TTL_SECONDS = 30
+PROMPT_LIST_CACHE_TTL_SECONDS = 5
+PROMPT_CACHE_MAX_SIZE = 1024
+PROMPT_LIST_CACHE_MAX_SIZE = 128
+
+# In-process caches for prompt reads, keyed by prompt ID and (skip, limit)
+prompt_cache: TTLCache = TTLCache(
+    maxsize=PROMPT_CACHE_MAX_SIZE, ttl=PROMPT_CACHE_TTL_SECONDS
+)
+prompt_list_cache: TTLCache = TTLCache(
+    maxsize=PROMPT_LIST_CACHE_MAX_SIZE, ttl=PROMPT_LIST_CACHE_TTL_SECONDS
+)
+
+# Bumped on every invalidation so reads that raced a write are not cached
+_generation = 0
+
+
+def prompt_cache_enabled() -> bool:
+    """Whether single prompts can be cached in this process."""
+    # Invalidation can't reach other workers, so set PROMPT_CACHE_ENABLED=false
+    # whenever the app runs with more than one worker
+    return os.getenv("PROMPT_CACHE_ENABLED", "true").lower() == "true"
+
+
+def cache_generation() -> int:
+    """Get the current cache generation, to be taken before a database read."""
+    return _generation
+
+
+def get_cached_prompt(prompt_id: str) -> Optional[Dict]:
+    """Get a cached prompt document."""
+    if not prompt_cache_enabled():
+        return None
+    return prompt_cache.get(prompt_id)
+
+
+def cache_prompt(prompt_id: str, prompt: Dict, generation: int):
+    """Cache a prompt document unless it was invalidated since the read began."""
+    if prompt_cache_enabled() and generation == _generation:
+        prompt_cache[prompt_id] = prompt
+
+
+def get_cached_prompt_list(skip: int, limit: int) -> Optional[List[Dict]]:
+    """Get a cached page of prompts."""
+    return prompt_list_cache.get((skip, limit))
+
+
+def cache_prompt_list(skip: int, limit: int, prompts: List[Dict], generation: int):
+    """Cache a page of prompts unless it was invalidated since the read began."""
+    if generation == _generation:
+        prompt_list_cache[(skip, limit)] = prompts
+
+
+def invalidate_prompt(prompt_id: Optional[str] = None):
+    """Drop a prompt and every cached prompt page after a write."""
+    global _generation
+    _generation += 1
+    if prompt_id:
+        prompt_cache.pop(prompt_id, None)
+    prompt_list_cache.clear()
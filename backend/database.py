@@ -8,10 +8,28 @@ load_dotenv()
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 DATABASE_NAME = "pinterest_ai"
 
+# Connection pool configuration, sized for AI validation concurrency (same
+# AI_MAX_CONCURRENT setting as services/ai_validation_service.py) plus headroom
+# for API requests
+MONGODB_POOL_HEADROOM = 20
+MONGODB_MAX_POOL_SIZE = int(
+    os.getenv(
+        "MONGODB_MAX_POOL_SIZE",
+        str(int(os.getenv("AI_MAX_CONCURRENT", "20")) + MONGODB_POOL_HEADROOM),
+    )
+)
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "5"))
+MONGODB_MAX_IDLE_TIME_MS = 60000
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = 5000
+
 # Collections
 PROMPTS_COLLECTION = "prompts"
 SESSIONS_COLLECTION = "sessions"
 PINS_COLLECTION = "pins"
+VALIDATION_CACHE_COLLECTION = "validation_cache"
+
+# Seconds before a cached AI validation result expires
+VALIDATION_CACHE_TTL_SECONDS = 86400
 
 # Global database client
 client: AsyncIOMotorClient = None
@@ -21,11 +39,30 @@ database = None
 async def connect_to_mongo():
     """Connect to MongoDB database."""
     global client, database
-    client = AsyncIOMotorClient(MONGODB_URI)
+    client = AsyncIOMotorClient(
+        MONGODB_URI,
+        maxPoolSize=MONGODB_MAX_POOL_SIZE,
+        minPoolSize=MONGODB_MIN_POOL_SIZE,
+        maxIdleTimeMS=MONGODB_MAX_IDLE_TIME_MS,
+        serverSelectionTimeoutMS=MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+    )
     database = client[DATABASE_NAME]
+    await create_indexes()
     print(f"Connected to MongoDB: {DATABASE_NAME}")
 
 
+async def create_indexes():
+    """Create indexes used by the workflow queries."""
+    await database[PROMPTS_COLLECTION].create_index([("created_at", -1)])
+    await database[PINS_COLLECTION].create_index([("prompt_id", 1), ("status", 1)])
+    await database[SESSIONS_COLLECTION].create_index(
+        [("prompt_id", 1), ("stage", 1), ("timestamp", -1)]
+    )
+    await database[VALIDATION_CACHE_COLLECTION].create_index(
+        "created_at", expireAfterSeconds=VALIDATION_CACHE_TTL_SECONDS
+    )
+
+
 async def close_mongo_connection():
     """Close MongoDB connection."""
     global client
@@ -1,12 +1,26 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from database import connect_to_mongo, close_mongo_connection
+from database import connect_to_mongo, close_mongo_connection, get_database
 from routes import prompts
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect to MongoDB on startup and close the connection on shutdown."""
+    await connect_to_mongo()
+    # Open a pooled connection before the first request arrives
+    await get_database().command("ping")
+    yield
+    await close_mongo_connection()
+
+
 app = FastAPI(
     title="Pinterest AI Content Discovery API",
     description="AI-powered system for discovering and validating Pinterest images",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS for frontend communication
@@ -19,18 +33,6 @@ app.add_middleware(
 )
 
 
-@app.on_event("startup")
-async def startup_db_client():
-    """Connect to MongoDB on startup."""
-    await connect_to_mongo()
-
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    """Close MongoDB connection on shutdown."""
-    await close_mongo_connection()
-
-
 # Include routers
 app.include_router(prompts.router)
 
@@ -54,4 +56,15 @@ async def health_check():
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    workers = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+    # Exported so worker processes see it; the prompt cache is per-process
+    os.environ.setdefault("PROMPT_CACHE_ENABLED", str(workers == 1).lower())
+
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        workers=workers,
+        loop="auto",
+        http="auto",
+    )
@@ -1,7 +1,10 @@
+import asyncio
 from typing import List, Optional, Dict
 from fastapi import APIRouter, HTTPException, status, BackgroundTasks
+from pymongo import ReturnDocument
 from bson import ObjectId
-from datetime import datetime
+from bson.errors import InvalidId
+from datetime import datetime, timedelta
 
 from models import PromptCreate, PromptResponse
 from database import (
@@ -10,11 +13,22 @@ from database import (
     SESSIONS_COLLECTION,
     PINS_COLLECTION,
 )
+from cache import (
+    cache_generation,
+    cache_prompt,
+    cache_prompt_list,
+    get_cached_prompt,
+    get_cached_prompt_list,
+    invalidate_prompt,
+)
 from services.pinterest_service import run_pinterest_workflow
 from services.ai_validation_service import run_ai_validation
 
 router = APIRouter(prefix="/api/prompts", tags=["prompts"])
 
+# A processing prompt older than this is assumed to belong to a dead workflow
+WORKFLOW_STALE_AFTER = timedelta(hours=1)
+
 
 @router.post("/", response_model=PromptResponse, status_code=status.HTTP_201_CREATED)
 async def create_prompt(prompt: PromptCreate):
@@ -30,15 +44,14 @@ async def create_prompt(prompt: PromptCreate):
         }
 
         result = await collection.insert_one(prompt_doc)
+        invalidate_prompt()
 
         # Return the created prompt
-        created_prompt = await collection.find_one({"_id": result.inserted_id})
-
         return PromptResponse(
-            id=str(created_prompt["_id"]),
-            text=created_prompt["text"],
-            created_at=created_prompt["created_at"],
-            status=created_prompt["status"],
+            id=str(result.inserted_id),
+            text=prompt_doc["text"],
+            created_at=prompt_doc["created_at"],
+            status=prompt_doc["status"],
         )
 
     except Exception as e:
@@ -52,19 +65,26 @@ async def create_prompt(prompt: PromptCreate):
 async def get_prompt(prompt_id: str):
     """Get a specific prompt by ID."""
     try:
-        if not ObjectId.is_valid(prompt_id):
+        try:
+            oid = ObjectId(prompt_id)
+        except InvalidId:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid prompt ID format",
             )
 
-        collection = get_collection(PROMPTS_COLLECTION)
-        prompt = await collection.find_one({"_id": ObjectId(prompt_id)})
+        prompt = get_cached_prompt(prompt_id)
+        if prompt is None:
+            generation = cache_generation()
+            collection = get_collection(PROMPTS_COLLECTION)
+            prompt = await collection.find_one({"_id": oid})
 
-        if not prompt:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Prompt not found"
-            )
+            if not prompt:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Prompt not found"
+                )
+
+            cache_prompt(prompt_id, prompt, generation)
 
         return PromptResponse(
             id=str(prompt["_id"]),
@@ -86,19 +106,30 @@ async def get_prompt(prompt_id: str):
 async def list_prompts(skip: int = 0, limit: int = 10):
     """List all prompts with pagination."""
     try:
+        cached_prompts = get_cached_prompt_list(skip, limit)
+        if cached_prompts is not None:
+            return cached_prompts
+
+        generation = cache_generation()
         collection = get_collection(PROMPTS_COLLECTION)
-        cursor = collection.find().sort("created_at", -1).skip(skip).limit(limit)
-
-        prompts = []
-        async for prompt in cursor:
-            prompts.append(
-                PromptResponse(
-                    id=str(prompt["_id"]),
-                    text=prompt["text"],
-                    created_at=prompt["created_at"],
-                    status=prompt["status"],
-                )
-            )
+        cursor = (
+            collection.find({}, {"text": 1, "created_at": 1, "status": 1})
+            .sort("created_at", -1)
+            .skip(skip)
+            .limit(limit)
+        )
+
+        # Rows are validated as a whole list against the response_model
+        prompts = [
+            {
+                "id": str(prompt["_id"]),
+                "text": prompt["text"],
+                "created_at": prompt["created_at"],
+                "status": prompt["status"],
+            }
+            async for prompt in cursor
+        ]
+        cache_prompt_list(skip, limit, prompts, generation)
 
         return prompts
 
@@ -113,7 +144,9 @@ async def list_prompts(skip: int = 0, limit: int = 10):
 async def delete_prompt(prompt_id: str):
     """Delete a prompt and all associated data."""
     try:
-        if not ObjectId.is_valid(prompt_id):
+        try:
+            oid = ObjectId(prompt_id)
+        except InvalidId:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid prompt ID format",
@@ -121,19 +154,23 @@ async def delete_prompt(prompt_id: str):
 
         # Delete prompt
         prompts_collection = get_collection(PROMPTS_COLLECTION)
-        result = await prompts_collection.delete_one({"_id": ObjectId(prompt_id)})
+        result = await prompts_collection.delete_one({"_id": oid})
 
         if result.deleted_count == 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Prompt not found"
             )
 
+        invalidate_prompt(prompt_id)
+
         # Delete associated sessions and pins
         sessions_collection = get_collection(SESSIONS_COLLECTION)
         pins_collection = get_collection(PINS_COLLECTION)
 
-        await sessions_collection.delete_many({"prompt_id": prompt_id})
-        await pins_collection.delete_many({"prompt_id": prompt_id})
+        await asyncio.gather(
+            sessions_collection.delete_many({"prompt_id": prompt_id}),
+            pins_collection.delete_many({"prompt_id": prompt_id}),
+        )
 
     except HTTPException:
         raise
@@ -148,25 +185,41 @@ async def delete_prompt(prompt_id: str):
 async def start_pinterest_workflow(prompt_id: str, background_tasks: BackgroundTasks):
     """Start the Pinterest workflow (warm-up + scraping) for a prompt."""
     try:
-        if not ObjectId.is_valid(prompt_id):
+        try:
+            oid = ObjectId(prompt_id)
+        except InvalidId:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid prompt ID format",
             )
 
-        # Check if prompt exists
+        # Atomically mark the prompt as processing unless a workflow is running
+        now = datetime.utcnow()
         collection = get_collection(PROMPTS_COLLECTION)
-        prompt = await collection.find_one({"_id": ObjectId(prompt_id)})
+        prompt = await collection.find_one_and_update(
+            {
+                "_id": oid,
+                "$or": [
+                    {"status": {"$ne": "processing"}},
+                    {"processing_started_at": {"$exists": False}},
+                    {"processing_started_at": {"$lt": now - WORKFLOW_STALE_AFTER}},
+                ],
+            },
+            {"$set": {"status": "processing", "processing_started_at": now}},
+            return_document=ReturnDocument.AFTER,
+        )
 
         if not prompt:
+            if await collection.count_documents({"_id": oid}, limit=1):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Workflow already in progress",
+                )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Prompt not found"
             )
 
-        # Update prompt status to processing
-        await collection.update_one(
-            {"_id": ObjectId(prompt_id)}, {"$set": {"status": "processing"}}
-        )
+        invalidate_prompt(prompt_id)
 
         # Start Pinterest workflow in background
         background_tasks.add_task(run_pinterest_workflow, prompt_id, prompt["text"])
@@ -190,7 +243,9 @@ async def start_pinterest_workflow(prompt_id: str, background_tasks: BackgroundT
 async def start_ai_validation(prompt_id: str, background_tasks: BackgroundTasks):
     """Start AI validation for all pins of a prompt."""
     try:
-        if not ObjectId.is_valid(prompt_id):
+        try:
+            oid = ObjectId(prompt_id)
+        except InvalidId:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid prompt ID format",
@@ -198,7 +253,7 @@ async def start_ai_validation(prompt_id: str, background_tasks: BackgroundTasks)
 
         # Check if prompt exists
         collection = get_collection(PROMPTS_COLLECTION)
-        prompt = await collection.find_one({"_id": ObjectId(prompt_id)})
+        prompt = await collection.find_one({"_id": oid})
 
         if not prompt:
             raise HTTPException(
@@ -1,24 +1,117 @@
 import os
+import re
+import json
+import hashlib
+import itertools
 import asyncio
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import httpx
 from openai import AsyncOpenAI
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from bson import ObjectId
 from dotenv import load_dotenv
 
 from models import PinStatus
+from cache import invalidate_prompt
 from database import (
     get_collection,
     PINS_COLLECTION,
     PROMPTS_COLLECTION,
     SESSIONS_COLLECTION,
+    VALIDATION_CACHE_COLLECTION,
 )
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Number of validated pins to accumulate before flushing to MongoDB
+VALIDATION_FLUSH_SIZE = 20
+
+# Pending pins fetched per cursor batch (and per validation cache lookup)
+VALIDATION_CURSOR_BATCH_SIZE = 50
+
+# Attempts to write the last buffered pin updates before giving up
+VALIDATION_FINAL_FLUSH_ATTEMPTS = 3
+
+# Maximum number of concurrent AI validation requests
+AI_MAX_CONCURRENT = int(os.getenv("AI_MAX_CONCURRENT", "20"))
+
+# Retries (with exponential backoff) for rate-limited or failed AI requests
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "5"))
+
+# Reuse stored results for an image already validated with the same prompt
+AI_VALIDATION_CACHE_ENABLED = (
+    os.getenv("AI_VALIDATION_CACHE_ENABLED", "true").lower() == "true"
+)
+
+# Seconds between flushes of buffered validation progress to the session log
+VALIDATION_LOG_FLUSH_INTERVAL = 2
+
+# Fallback pattern for pulling a score out of a free-text AI response
+SCORE_PATTERN = re.compile(r"(\d+\.?\d*)")
+
+# Validation instructions sent with every image; {prompt_text} is filled in per batch
+VALIDATION_PROMPT_TEMPLATE = """
+Analyze this image and determine how well it matches the visual prompt: "{prompt_text}"
+
+Consider:
+1. Visual style and aesthetic
+2. Content and subject matter
+3. Color scheme and mood
+4. Overall relevance to the prompt
+5. Quality and clarity of the image
+6. Specificity of match (generic vs. specific to prompt)
+
+Be STRICT in your evaluation. Only approve images that are:
+- Highly relevant to the specific prompt
+- Show the exact style/aesthetic mentioned
+- Have good visual quality
+- Are not generic or loosely related
+
+Provide:
+1. A match score from 0.0 to 1.0 (where 1.0 is perfect match)
+2. A brief explanation of your reasoning
+3. Classification: "approved" if score >= 0.5, "disqualified" if score < 0.5
+
+Format your response as JSON:
+{{
+    "match_score": 0.85,
+    "explanation": "This image shows a minimalist bedroom with clean lines, neutral colors, and simple furniture that perfectly matches the prompt.",
+    "classification": "approved"
+}}
+"""
+
+# Structured output schema enforced by the OpenAI API for validation responses
+VALIDATION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "pin_validation",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "match_score": {"type": "number"},
+                "explanation": {"type": "string"},
+                "classification": {
+                    "type": "string",
+                    "enum": ["approved", "disqualified"],
+                },
+            },
+            "required": ["match_score", "explanation", "classification"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def validation_cache_key(image_url: str, validation_prompt: str) -> str:
+    """Hash an image URL and validation prompt into a validation cache key."""
+    return hashlib.sha256(f"{image_url}|{validation_prompt}".encode()).hexdigest()
+
 
 class AIValidationService:
     def __init__(self):
@@ -26,42 +119,18 @@ class AIValidationService:
         if not self.api_key:
             raise ValueError("AI_API_KEY environment variable is required")
 
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.client = AsyncOpenAI(api_key=self.api_key, max_retries=AI_MAX_RETRIES)
 
-    async def validate_pin(self, pin_data: Dict, prompt_text: str) -> Dict:
+    async def validate_pin(self, pin_data: Dict, validation_prompt: str) -> Dict:
         """Validate a single pin against the prompt using AI."""
-        try:
-            # Prepare the validation prompt
-            validation_prompt = f"""
-            Analyze this image and determine how well it matches the visual prompt: "{prompt_text}"
-            
-            Consider:
-            1. Visual style and aesthetic
-            2. Content and subject matter
-            3. Color scheme and mood
-            4. Overall relevance to the prompt
-            5. Quality and clarity of the image
-            6. Specificity of match (generic vs. specific to prompt)
-            
-            Be STRICT in your evaluation. Only approve images that are:
-            - Highly relevant to the specific prompt
-            - Show the exact style/aesthetic mentioned
-            - Have good visual quality
-            - Are not generic or loosely related
-            
-            Provide:
-            1. A match score from 0.0 to 1.0 (where 1.0 is perfect match)
-            2. A brief explanation of your reasoning
-            3. Classification: "approved" if score >= 0.5, "disqualified" if score < 0.5
-            
-            Format your response as JSON:
-            {{
-                "match_score": 0.85,
-                "explanation": "This image shows a minimalist bedroom with clean lines, neutral colors, and simple furniture that perfectly matches the prompt.",
-                "classification": "approved"
-            }}
-            """
+        validation_result, _ = await self._validate_pin(pin_data, validation_prompt)
+        return validation_result
 
+    async def _validate_pin(
+        self, pin_data: Dict, validation_prompt: str
+    ) -> Tuple[Dict, bool]:
+        """Validate a pin; the flag is True only for a parsed AI response."""
+        try:
             # Get the image URL
             image_url = pin_data.get("image_url")
             if not image_url:
@@ -69,7 +138,7 @@ class AIValidationService:
                     "match_score": 0.0,
                     "explanation": "No image URL provided",
                     "classification": "disqualified",
-                }
+                }, False
 
             # Call OpenAI API for image analysis
             response = await self.client.chat.completions.create(
@@ -85,45 +154,51 @@ class AIValidationService:
                 ],
                 max_tokens=500,
                 temperature=0.1,  # Low temperature for consistent results
+                response_format=VALIDATION_RESPONSE_FORMAT,
             )
 
             # Parse the response
-            ai_response = response.choices[0].message.content
+            message = response.choices[0].message
+            ai_response = message.content
+
+            # Refusals come back with no content instead of schema output
+            refusal = getattr(message, "refusal", None)
+            if refusal or not ai_response:
+                logger.error(f"AI returned no validation for pin {pin_data.get('_id')}")
+                return {
+                    "match_score": 0.0,
+                    "explanation": (
+                        f"AI declined to validate: {refusal}"
+                        if refusal
+                        else "Empty AI response"
+                    ),
+                    "classification": "disqualified",
+                }, False
 
-            # Try to extract JSON from the response
+            # The response is constrained to the validation JSON schema
             try:
-                import json
-
-                # Find JSON in the response (in case there's extra text)
-                start_idx = ai_response.find("{")
-                end_idx = ai_response.rfind("}") + 1
-                if start_idx != -1 and end_idx != 0:
-                    json_str = ai_response[start_idx:end_idx]
-                    result = json.loads(json_str)
-
-                    # Validate the response format
-                    match_score = float(result.get("match_score", 0.0))
-                    explanation = result.get("explanation", "No explanation provided")
-                    classification = result.get("classification", "disqualified")
-
-                    # Ensure classification is correct based on score
-                    if match_score >= 0.5 and classification != "approved":
-                        classification = "approved"
-                    elif match_score < 0.5 and classification != "disqualified":
-                        classification = "disqualified"
-
-                    return {
-                        "match_score": match_score,
-                        "explanation": explanation,
-                        "classification": classification,
-                    }
-                else:
-                    raise ValueError("No JSON found in response")
+                result = json.loads(ai_response)
+
+                match_score = float(result["match_score"])
+                explanation = result["explanation"]
+                classification = result["classification"]
 
-            except (json.JSONDecodeError, ValueError) as e:
+                # Ensure classification is correct based on score
+                if match_score >= 0.5 and classification != "approved":
+                    classification = "approved"
+                elif match_score < 0.5 and classification != "disqualified":
+                    classification = "disqualified"
+
+                return {
+                    "match_score": match_score,
+                    "explanation": explanation,
+                    "classification": classification,
+                }, True
+
+            except (TypeError, KeyError, ValueError) as e:
+                # Truncated output can still miss the schema
                 logger.error(f"Failed to parse AI response: {e}")
-                # Fallback: try to extract score from text
-                return self._extract_score_from_text(ai_response, prompt_text)
+                return self._extract_score_from_text(ai_response), False
 
         except Exception as e:
             logger.error(f"AI validation error for pin {pin_data.get('_id')}: {str(e)}")
@@ -131,16 +206,41 @@ class AIValidationService:
                 "match_score": 0.0,
                 "explanation": f"AI validation failed: {str(e)}",
                 "classification": "disqualified",
+            }, False
+
+    async def _get_cached_validations(
+        self, pins: List[Dict], validation_prompt: str
+    ) -> Dict:
+        """Get cached validation results for a batch of pins, keyed by pin ID."""
+        if not AI_VALIDATION_CACHE_ENABLED:
+            return {}
+
+        # Pins in one batch can share an image, so each key maps to every pin using it
+        keys: Dict[str, List] = {}
+        for pin in pins:
+            if pin.get("image_url"):
+                key = validation_cache_key(pin["image_url"], validation_prompt)
+                keys.setdefault(key, []).append(pin["_id"])
+        if not keys:
+            return {}
+
+        try:
+            collection = get_collection(VALIDATION_CACHE_COLLECTION)
+            cursor = collection.find({"_id": {"$in": list(keys)}}, {"result": 1})
+            return {
+                pin_id: cached["result"]
+                async for cached in cursor
+                for pin_id in keys[cached["_id"]]
             }
+        except Exception as e:
+            logger.error(f"Failed to read validation cache: {str(e)}")
+            return {}
 
-    def _extract_score_from_text(self, text: str, prompt_text: str) -> Dict:
+    def _extract_score_from_text(self, text: str) -> Dict:
         """Fallback method to extract score from AI response text."""
         try:
-            # Look for score patterns in the text
-            import re
-
             # Look for numbers between 0 and 1
-            score_match = re.search(r"(\d+\.?\d*)", text)
+            score_match = SCORE_PATTERN.search(text)
             if score_match:
                 score = float(score_match.group(1))
                 if score > 1.0:
@@ -167,28 +267,33 @@ class AIValidationService:
             }
 
     async def validate_pins_batch(
-        self, prompt_id: str, max_concurrent: int = 5
+        self, prompt_id: str, max_concurrent: int = AI_MAX_CONCURRENT
     ) -> Dict:
         """Validate all pins for a given prompt in batches."""
         try:
             # Get the prompt text
             prompts_collection = get_collection(PROMPTS_COLLECTION)
-            from bson import ObjectId
-
             prompt = await prompts_collection.find_one({"_id": ObjectId(prompt_id)})
             if not prompt:
                 raise ValueError(f"Prompt {prompt_id} not found")
 
             prompt_text = prompt["text"]
+            validation_prompt = VALIDATION_PROMPT_TEMPLATE.format(
+                prompt_text=prompt_text
+            )
 
-            # Get all pending pins for this prompt
+            # Count pending pins for this prompt; they are streamed below
             pins_collection = get_collection(PINS_COLLECTION)
-            pending_pins = await pins_collection.find(
-                {"prompt_id": prompt_id, "status": "pending"}
-            ).to_list(length=None)
+            pending_query = {"prompt_id": prompt_id, "status": "pending"}
+            total_pins = await pins_collection.count_documents(pending_query)
 
-            if not pending_pins:
+            if not total_pins:
                 logger.info(f"No pending pins found for prompt {prompt_id}")
+                # Nothing to validate, so the workflow is finished
+                await prompts_collection.update_one(
+                    {"_id": ObjectId(prompt_id)}, {"$set": {"status": "completed"}}
+                )
+                invalidate_prompt(prompt_id)
                 return {
                     "total_pins": 0,
                     "validated_pins": 0,
@@ -197,128 +302,301 @@ class AIValidationService:
                 }
 
             logger.info(
-                f"Starting validation of {len(pending_pins)} pins for prompt: {prompt_text}"
+                f"Starting validation of {total_pins} pins for prompt: {prompt_text}"
             )
 
             # Update session with validation start
+            session_id = None
             try:
                 collection = get_collection(SESSIONS_COLLECTION)
-                await collection.insert_one(
+                session_insert = await collection.insert_one(
                     {
                         "prompt_id": prompt_id,
                         "stage": "validation",
                         "status": "pending",
                         "timestamp": datetime.utcnow(),
-                        "log": [f"Starting AI validation of {len(pending_pins)} pins"],
+                        "log": [f"Starting AI validation of {total_pins} pins"],
                     }
                 )
+                session_id = session_insert.inserted_id
             except Exception as e:
                 logger.error(f"Failed to create validation session: {str(e)}")
 
             # Process pins in batches to avoid rate limits
             semaphore = asyncio.Semaphore(max_concurrent)
-            validated_count = 0
-            approved_count = 0
-            disqualified_count = 0
+            progress = itertools.count(1)
+
+            # Pin updates are buffered as (classification, op) and written in bulk
+            pending_updates: List[Tuple[str, UpdateOne]] = []
+            pending_cache_updates: List[UpdateOne] = []
+            buffer_lock = asyncio.Lock()
+
+            async def flush_pin_updates():
+                # Failed writes are re-queued for the next flush instead of raising
+                async with buffer_lock:
+                    updates = pending_updates[:]
+                    cache_updates = pending_cache_updates[:]
+                    pending_updates.clear()
+                    pending_cache_updates.clear()
+
+                # Cache writes are best effort and not retried
+                if cache_updates:
+                    try:
+                        cache_collection = get_collection(VALIDATION_CACHE_COLLECTION)
+                        await cache_collection.bulk_write(cache_updates, ordered=False)
+                    except Exception as e:
+                        logger.error(f"Failed to write validation cache: {str(e)}")
+
+                if not updates:
+                    return
+
+                try:
+                    await pins_collection.bulk_write(
+                        [op for _, op in updates], ordered=False
+                    )
+                    return
+                except BulkWriteError as e:
+                    failed = {error["index"] for error in e.details["writeErrors"]}
+                    retry = [u for i, u in enumerate(updates) if i in failed]
+                    error_message = str(e)
+                except Exception as e:
+                    retry = updates
+                    error_message = str(e)
+
+                if retry:
+                    logger.error(
+                        f"Failed to save {len(retry)} validated pins: {error_message}"
+                    )
+                    async with buffer_lock:
+                        pending_updates.extend(retry)
+
+            # Session log lines are buffered and flushed on a timer
+            log_buffer: List[str] = []
+            log_lock = asyncio.Lock()
+            validation_done = asyncio.Event()
 
-            async def validate_single_pin(pin_data):
-                nonlocal validated_count, approved_count, disqualified_count
+            async def flush_logs():
+                async with log_lock:
+                    log_lines = log_buffer[:]
+                    log_buffer.clear()
 
-                async with semaphore:
+                if log_lines and session_id:
                     try:
-                        # Validate the pin
-                        validation_result = await self.validate_pin(
-                            pin_data, prompt_text
+                        session_collection = get_collection(SESSIONS_COLLECTION)
+                        await session_collection.update_one(
+                            {"_id": session_id},
+                            {"$push": {"log": {"$each": log_lines}}},
                         )
-
-                        # Update the pin in database
-                        await pins_collection.update_one(
-                            {"_id": pin_data["_id"]},
-                            {
-                                "$set": {
-                                    "match_score": validation_result["match_score"],
-                                    "status": validation_result["classification"],
-                                    "ai_explanation": validation_result["explanation"],
-                                }
-                            },
+                    except Exception as e:
+                        logger.error(
+                            f"Failed to update validation session log: {str(e)}"
                         )
 
-                        # Update counters
-                        validated_count += 1
-                        if validation_result["classification"] == "approved":
-                            approved_count += 1
-                        else:
-                            disqualified_count += 1
-
-                        logger.info(
-                            f"Validated pin {validated_count}/{len(pending_pins)} - Score: {validation_result['match_score']:.2f} - {validation_result['classification']}"
+            async def flush_logs_periodically():
+                # Runs one last flush after validation_done is set
+                while not validation_done.is_set():
+                    try:
+                        await asyncio.wait_for(
+                            validation_done.wait(),
+                            timeout=VALIDATION_LOG_FLUSH_INTERVAL,
                         )
+                    except asyncio.TimeoutError:
+                        pass
+                    await flush_logs()
+
+            async def validate_single_pin(
+                pin_data, cached_result
+            ) -> Optional[Tuple[str, float]]:
+                try:
+                    cache_update = None
+                    if cached_result:
+                        validation_result = cached_result
+                    else:
+                        # Only the AI call holds a concurrency slot
+                        async with semaphore:
+                            validation_result, cacheable = await self._validate_pin(
+                                pin_data, validation_prompt
+                            )
 
-                        # Update session log with progress
-                        try:
-                            session_collection = get_collection(SESSIONS_COLLECTION)
-                            latest_session = await session_collection.find_one(
-                                {"prompt_id": prompt_id, "stage": "validation"},
-                                sort=[("timestamp", -1)],
+                        if cacheable and AI_VALIDATION_CACHE_ENABLED:
+                            cache_update = UpdateOne(
+                                {
+                                    "_id": validation_cache_key(
+                                        pin_data["image_url"], validation_prompt
+                                    )
+                                },
+                                {
+                                    "$set": {
+                                        "result": validation_result,
+                                        "created_at": datetime.utcnow(),
+                                    }
+                                },
+                                upsert=True,
                             )
-                            if latest_session:
-                                await session_collection.update_one(
-                                    {"_id": latest_session["_id"]},
+
+                    async with buffer_lock:
+                        if cache_update:
+                            pending_cache_updates.append(cache_update)
+
+                        # Queue the pin update
+                        pending_updates.append(
+                            (
+                                validation_result["classification"],
+                                UpdateOne(
+                                    {"_id": pin_data["_id"]},
                                     {
-                                        "$push": {
-                                            "log": f"Validated pin {validated_count}/{len(pending_pins)} - {validation_result['classification']}"
+                                        "$set": {
+                                            "match_score": validation_result[
+                                                "match_score"
+                                            ],
+                                            "status": validation_result[
+                                                "classification"
+                                            ],
+                                            "ai_explanation": validation_result[
+                                                "explanation"
+                                            ],
                                         }
                                     },
-                                )
-                        except Exception as e:
-                            logger.error(
-                                f"Failed to update validation session log: {str(e)}"
+                                ),
                             )
+                        )
 
-                    except Exception as e:
-                        logger.error(
-                            f"Error validating pin {pin_data.get('_id')}: {str(e)}"
+                        # Multiples only, so re-queued failures don't flush per pin
+                        should_flush = len(pending_updates) % VALIDATION_FLUSH_SIZE == 0
+
+                    # Queue the session log line with progress
+                    pin_number = next(progress)
+                    async with log_lock:
+                        log_buffer.append(
+                            f"Validated pin {pin_number}/{total_pins} - {validation_result['classification']}"
                         )
 
-            # Create tasks for all pins
-            tasks = [validate_single_pin(pin) for pin in pending_pins]
+                    logger.info(
+                        f"Validated pin {pin_number}/{total_pins} - Score: {validation_result['match_score']:.2f} - {validation_result['classification']}"
+                    )
 
-            # Wait for all validations to complete
-            await asyncio.gather(*tasks, return_exceptions=True)
+                    if should_flush:
+                        await flush_pin_updates()
+
+                    return (
+                        validation_result["classification"],
+                        validation_result["match_score"],
+                    )
 
-            # Update prompt status to completed
+                except Exception as e:
+                    logger.error(
+                        f"Error validating pin {pin_data.get('_id')}: {str(e)}"
+                    )
+                    return None
+
+            log_flusher = asyncio.create_task(flush_logs_periodically())
+            in_flight = set()
+            finished = []
+            try:
+                # Stream pins from the cursor with a bounded number of tasks in flight
+                cursor = pins_collection.find(
+                    pending_query,
+                    {"image_url": 1},
+                    batch_size=VALIDATION_CURSOR_BATCH_SIZE,
+                )
+
+                async def pin_batches():
+                    batch = []
+                    async for pin in cursor:
+                        batch.append(pin)
+                        if len(batch) == VALIDATION_CURSOR_BATCH_SIZE:
+                            yield batch
+                            batch = []
+                    if batch:
+                        yield batch
+
+                async for pin_batch in pin_batches():
+                    # One cache lookup per batch, outside the concurrency slots
+                    cached_results = await self._get_cached_validations(
+                        pin_batch, validation_prompt
+                    )
+                    for pin in pin_batch:
+                        in_flight.add(
+                            asyncio.create_task(
+                                validate_single_pin(pin, cached_results.get(pin["_id"]))
+                            )
+                        )
+                        if len(in_flight) >= max_concurrent * 2:
+                            done, in_flight = await asyncio.wait(
+                                in_flight, return_when=asyncio.FIRST_COMPLETED
+                            )
+                            finished.extend(done)
+
+                # Wait for the remaining validations to complete
+                results = [task.result() for task in finished]
+                results.extend(await asyncio.gather(*in_flight, return_exceptions=True))
+
+                # Write any remaining buffered pin updates, retrying failures
+                for attempt in range(VALIDATION_FINAL_FLUSH_ATTEMPTS):
+                    if attempt:
+                        await asyncio.sleep(2**attempt)
+                    await flush_pin_updates()
+                    if not pending_updates:
+                        break
+            except BaseException:
+                # Don't leave validations running after the batch has failed
+                for task in in_flight:
+                    task.cancel()
+                await asyncio.gather(*in_flight, return_exceptions=True)
+                raise
+            finally:
+                # Stop the log flusher after its final flush
+                validation_done.set()
+                await log_flusher
+
+            # Aggregate the per-pin results, leaving out results that were not saved
+            classifications = [r[0] for r in results if isinstance(r, tuple)]
+            for classification, _ in pending_updates:
+                classifications.remove(classification)
+            unsaved_count = len(pending_updates)
+            validated_count = len(classifications)
+            approved_count = classifications.count("approved")
+            disqualified_count = validated_count - approved_count
+
+            # Unsaved pins stay pending, so the run can't be reported as completed
+            if unsaved_count:
+                logger.error(
+                    f"Gave up saving {unsaved_count} validated pins for prompt {prompt_id}"
+                )
+                prompt_status, session_status = "error", "failed"
+                session_message = f"AI validation failed: {unsaved_count} validated pins could not be saved. Approved: {approved_count}, Disqualified: {disqualified_count}"
+            else:
+                prompt_status, session_status = "completed", "completed"
+                session_message = f"AI validation completed! Approved: {approved_count}, Disqualified: {disqualified_count}"
+
+            # Update prompt status
             await prompts_collection.update_one(
-                {"_id": ObjectId(prompt_id)}, {"$set": {"status": "completed"}}
+                {"_id": ObjectId(prompt_id)}, {"$set": {"status": prompt_status}}
             )
+            invalidate_prompt(prompt_id)
 
-            # Mark validation session as completed
+            # Mark validation session as finished
             try:
-                session_collection = get_collection(SESSIONS_COLLECTION)
-                latest_session = await session_collection.find_one(
-                    {"prompt_id": prompt_id, "stage": "validation"},
-                    sort=[("timestamp", -1)],
-                )
-                if latest_session:
+                if session_id:
+                    session_collection = get_collection(SESSIONS_COLLECTION)
                     await session_collection.update_one(
-                        {"_id": latest_session["_id"]},
+                        {"_id": session_id},
                         {
-                            "$set": {"status": "completed"},
-                            "$push": {
-                                "log": f"AI validation completed! Approved: {approved_count}, Disqualified: {disqualified_count}"
-                            },
+                            "$set": {"status": session_status},
+                            "$push": {"log": session_message},
                         },
                     )
             except Exception as e:
                 logger.error(f"Failed to update validation session status: {str(e)}")
 
             result = {
-                "total_pins": len(pending_pins),
+                "total_pins": total_pins,
                 "validated_pins": validated_count,
                 "approved_pins": approved_count,
                 "disqualified_pins": disqualified_count,
             }
 
-            logger.info(f"Validation completed: {result}")
+            logger.info(f"Validation {session_status}: {result}")
             return result
 
         except Exception as e:
@@ -328,15 +606,36 @@ class AIValidationService:
             await prompts_collection.update_one(
                 {"_id": ObjectId(prompt_id)}, {"$set": {"status": "error"}}
             )
+            invalidate_prompt(prompt_id)
             raise
 
 
+_service_singleton: Optional[AIValidationService] = None
+
+
+def get_ai_service() -> AIValidationService:
+    """Get the shared AI validation service, creating it on first use."""
+    global _service_singleton
+    if _service_singleton is None:
+        _service_singleton = AIValidationService()
+    return _service_singleton
+
+
 async def run_ai_validation(prompt_id: str) -> bool:
     """Run AI validation for all pins of a prompt."""
     try:
-        service = AIValidationService()
+        service = get_ai_service()
         result = await service.validate_pins_batch(prompt_id)
         return result["validated_pins"] > 0
     except Exception as e:
         logger.error(f"AI validation workflow error: {str(e)}")
+        # Covers failures before the batch could record the error itself
+        try:
+            prompts_collection = get_collection(PROMPTS_COLLECTION)
+            await prompts_collection.update_one(
+                {"_id": ObjectId(prompt_id)}, {"$set": {"status": "error"}}
+            )
+            invalidate_prompt(prompt_id)
+        except Exception as status_error:
+            logger.error(f"Failed to update prompt status: {str(status_error)}")
         return False
@@ -6,8 +6,16 @@ from datetime import datetime
 from playwright.async_api import async_playwright, Browser, Page
 from dotenv import load_dotenv
 
-from models import SessionStage, SessionStatus
-from database import get_collection, SESSIONS_COLLECTION, PINS_COLLECTION
+from bson import ObjectId
+
+from models import PromptStatus, SessionStage, SessionStatus
+from cache import invalidate_prompt
+from database import (
+    get_collection,
+    PROMPTS_COLLECTION,
+    SESSIONS_COLLECTION,
+    PINS_COLLECTION,
+)
 
 load_dotenv()
 
@@ -335,6 +343,17 @@ class PinterestService:
 
 async def run_pinterest_workflow(prompt_id: str, prompt_text: str) -> bool:
     """Run the complete Pinterest workflow (warm-up + scraping + auto-trigger AI validation)."""
+    try:
+        return await _run_pinterest_phases(prompt_id, prompt_text)
+    except Exception as e:
+        # Browser startup/shutdown failures happen outside the phase handling
+        logger.error(f"Pinterest workflow error: {str(e)}")
+        await update_prompt_status(prompt_id, PromptStatus.ERROR)
+        return False
+
+
+async def _run_pinterest_phases(prompt_id: str, prompt_text: str) -> bool:
+    """Run warm-up and scraping, then hand off to AI validation."""
     async with PinterestService() as pinterest:
         try:
             # Warm-up phase
@@ -351,6 +370,7 @@ async def run_pinterest_workflow(prompt_id: str, prompt_text: str) -> bool:
                 await update_session_status(
                     prompt_id, SessionStage.WARMUP, SessionStatus.FAILED
                 )
+                await update_prompt_status(prompt_id, PromptStatus.ERROR)
                 return False
 
             # Scraping phase
@@ -378,13 +398,27 @@ async def run_pinterest_workflow(prompt_id: str, prompt_text: str) -> bool:
                 await update_session_status(
                     prompt_id, SessionStage.SCRAPING, SessionStatus.FAILED
                 )
+                await update_prompt_status(prompt_id, PromptStatus.ERROR)
                 return False
 
         except Exception as e:
             logger.error(f"Pinterest workflow error: {str(e)}")
+            await update_prompt_status(prompt_id, PromptStatus.ERROR)
             return False
 
 
+async def update_prompt_status(prompt_id: str, status: PromptStatus):
+    """Update prompt status in the database."""
+    try:
+        collection = get_collection(PROMPTS_COLLECTION)
+        await collection.update_one(
+            {"_id": ObjectId(prompt_id)}, {"$set": {"status": status}}
+        )
+        invalidate_prompt(prompt_id)
+    except Exception as e:
+        logger.error(f"Error updating prompt status: {str(e)}")
+
+
 async def update_session_status(
     prompt_id: str, stage: SessionStage, status: SessionStatus
 ):